@@ -119,12 +119,11 @@ class Passthrough(Operations):
         return fd
 
     def read(self, path, length, offset, fh): # type: ignore
-        os.lseek(fh, offset, os.SEEK_SET)
-        return os.read(fh, length)
+        # pread/pwrite don't share the fd's file position, so threads can't race on it
+        return os.pread(fh, length, offset)
 
     def write(self, path, buf, offset, fh): # type: ignore
-        os.lseek(fh, offset, os.SEEK_SET)
-        return os.write(fh, buf)
+        return os.pwrite(fh, buf, offset)
 
     def truncate(self, path, length, fh=None): # type: ignore
         full_path = self._full_path(path)
@@ -1,16 +1,53 @@
 #!/usr/bin/env python
 
+import errno
+import operator
 import os
-import tempfile
+import stat
+import threading
 import time
 from pathlib import Path
-import zipfile
-from typing import Any, Optional, Tuple, Literal
+from typing import Any, Optional, Literal
 import yaml
 from fuse import FUSE
 from passthroughfs import Passthrough
-
-
+from ttlcache import TTLCache
+from zipindex import find_in_dir_zips, get_zip_index, open_member
+
+
+_STAT_KEYS = (
+    'st_atime', 'st_ctime', 'st_gid', 'st_mode', 'st_mtime',
+    'st_nlink', 'st_size', 'st_uid', 'st_blksize', 'st_blocks'
+)
+_get_stat_fields = operator.attrgetter(*_STAT_KEYS)
+
+
+def _stat_to_attrs(st: os.stat_result) -> dict:
+    """Convert a stat result into the getattr dict fusepy expects."""
+    return dict(zip(_STAT_KEYS, map(int, _get_stat_fields(st))))
+
+
+# getattr templates; virtual dirs get the mount time, zip members their archive mtime and size
+_VIRTUAL_DIR_ATTRS = {
+    'st_gid': 0,
+    'st_uid': 0,
+    'st_mode': 0o040755,  # directory
+    'st_nlink': 2,
+    'st_size': 4096,
+}
+_ZIP_FILE_ATTRS = {
+    'st_gid': 0,
+    'st_uid': 0,
+    'st_mode': 0o100444,  # regular file, read-only
+    'st_nlink': 1,
+    # Advertise large blocks so readers of extracted members use big buffers
+    'st_blksize': 128 * 1024,
+}
+
+# Seconds a virtual directory listing is reused between readdir/getattr calls
+_LISTING_TTL = 2.0
+# Stands in for a cached "no source path" result, since TTLCache.get returns None on a miss
+_NO_SOURCE = object()
 
 class TransFS(Passthrough):
     """FUSE filesystem for translating virtual paths to real files, including zip logic and filetype mapping."""
@@ -19,8 +56,54 @@ class TransFS(Passthrough):
         super().__init__(root_path)
         print("Starting TransFS")
         self.root = root_path
+        self._root_prefix = root_path.rstrip('/')
         with open("transfs.yaml", "r", encoding="UTF-8") as f:
-            self.config = yaml.safe_load(f)
+            # libyaml's loader when PyYAML was built with it; same result as safe_load
+            self.config = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        self._index_config()
+        # id(...SoftwareArchives... entry) -> (entry, mapping, reverse); holding the entry keeps its id unique
+        self._filetype_maps_cache: dict = {}
+        self._listing_cache = TTLCache(ttl=_LISTING_TTL, maxsize=1024)
+        self._source_cache = TTLCache(ttl=_LISTING_TTL, maxsize=4096)
+        self._attr_cache = TTLCache(ttl=_LISTING_TTL, maxsize=4096)
+        # Virtual directories report the mount time, so their attributes are built once
+        started = int(time.time())
+        self._virtual_dir_attrs = dict(
+            _VIRTUAL_DIR_ATTRS, st_atime=started, st_ctime=started, st_mtime=started
+        )
+        self._dir_cache = TTLCache(ttl=_LISTING_TTL, maxsize=1024)
+        # Paths getattr found missing; clients probe the same absent names (.DS_Store, Thumbs.db) repeatedly
+        self._missing_cache = TTLCache(ttl=_LISTING_TTL, maxsize=8192)
+        # Bumped by every invalidation; a lookup that straddles one must not store its stale result
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        # Path -> stamp of its last _forget_attrs, so a write only blocks attr fills for that one path
+        self._forgotten = TTLCache(ttl=_LISTING_TTL, maxsize=4096)
+        self._forget_count = 0
+
+    def _index_config(self):
+        """
+        Build name lookups for clients and their systems (first definition wins,
+        as the old scans did) and split each client's default_target_path once.
+        """
+        self._clients_by_name: dict = {}
+        self._systems_by_client: dict = {}
+        self._template_parts: dict = {}
+        for client in self.config.get('clients', []):
+            name = client.get('name')
+            if name is None or name in self._clients_by_name:
+                continue
+            self._clients_by_name[name] = client
+            systems: dict = {}
+            for system in client.get('systems', []):
+                systems.setdefault(system['name'], system)
+            self._systems_by_client[name] = systems
+            if 'default_target_path' in client:
+                self._template_parts[name] = Path(client['default_target_path']).parts
+
+    def _get_system(self, client_name: str, system_name: str) -> Optional[dict]:
+        """Return the named system of the named client, if both exist."""
+        return self._systems_by_client.get(client_name, {}).get(system_name)
 
     # --- Filetype mapping helpers ---
 
@@ -49,7 +132,11 @@ class TransFS(Passthrough):
         """
         Build filetype mapping and reverse mapping for a ...SoftwareArchives... entry.
         Returns: {virtual_folder: [real_exts]}, {real_ext: virtual_ext}
+        Parsed once per entry; callers must not modify the returned dicts.
         """
+        cached = self._filetype_maps_cache.get(id(sa_entry))
+        if cached is not None and cached[0] is sa_entry:
+            return cached[1], cached[2]
         filetypes = sa_entry["...SoftwareArchives..."].get("filetypes", [])
         mapping = {}
         reverse = {}
@@ -59,6 +146,7 @@ class TransFS(Passthrough):
                 for k, v in m.items():
                     mapping.setdefault(k, []).extend(v)
                 reverse.update(r)
+        self._filetype_maps_cache[id(sa_entry)] = (sa_entry, mapping, reverse)
         return mapping, reverse
 
     def _virtual_to_real_candidates(self, virtual_folder, filename, filetype_map):
@@ -80,22 +168,32 @@ class TransFS(Passthrough):
     # --- End filetype mapping helpers ---
 
     def _is_virtual_path(self, full_path: str) -> bool:
-        """Check if a path is a virtual (not real) path."""
-        parts = Path(full_path).parts
-        if not os.path.isdir(full_path) and not os.path.isfile(full_path):
-            if self._client_exists(parts[len(Path(self.root).parts)]):
-                return True
-        return False
+        """Check if a path is a virtual (not real) path listed by its parent."""
+        # One stat instead of isdir() then isfile(), with the same error handling
+        try:
+            st = os.stat(full_path)
+        except (OSError, ValueError):
+            pass
+        else:
+            if stat.S_ISDIR(st.st_mode) or stat.S_ISREG(st.st_mode):
+                return False
+        parent_path, name = os.path.split(full_path)
+        return self._parse_trans_path_contains(parent_path, name)
 
     def _client_exists(self, name_to_check: str) -> bool:
         """Check if a client exists in the config."""
-        return any(client.get("name") == name_to_check for client in self.config.get("clients", []))
+        return name_to_check in self._clients_by_name
+
+    def _rel_parts(self, full_path: str) -> tuple:
+        """Split a path under self.root into its components below the root, without pathlib."""
+        return tuple(part for part in full_path[len(self._root_prefix):].split('/') if part)
 
     def _full_path(self, partial: str) -> str:
         """Convert a FUSE path to a full path in the filestore."""
+        # Plain concatenation; fusepy paths are always absolute, so os.path.join adds nothing
         if partial.startswith("/"):
-            partial = partial[1:]
-        return os.path.join(self.root, partial)
+            return self._root_prefix + partial
+        return self._root_prefix + "/" + partial
 
     def _get_system_info(self, client: dict, rel_parts: list, path_template_parts: tuple) -> Optional[dict]:
         """Extract system info from the config."""
@@ -109,66 +207,117 @@ class TransFS(Passthrough):
                 if sys['name'] in rel_parts:
                     system_name = sys['name']
                     break
-        return next((s for s in client['systems'] if s['name'] == system_name), None)
+        return self._get_system(client['name'], system_name)
 
     def _find_software_archive_entry(self, system_info: dict) -> Optional[dict]:
         """Find the ...SoftwareArchives... entry in a system's maps."""
         return next((m for m in system_info['maps'] if list(m.keys())[0] == "...SoftwareArchives..."), None)
 
-    def _list_zip_file(self, zip_path: str) -> list:
-        """Return a list of files (not directories) in a zip archive."""
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            return [n for n in zf.namelist() if not n.endswith('/')]
-
-
-    def _find_file_in_zips(self, parent_dir: str, filename: str) -> Optional[Tuple[str, str]]:
-        """Search all zip files in a directory for a file with the given name."""
-        for entry in os.listdir(parent_dir):
-            if entry.lower().endswith('.zip'):
-                zip_path = os.path.join(parent_dir, entry)
-                with zipfile.ZipFile(zip_path, 'r') as zf:
-                    for name in zf.namelist():
-                        if name.split('/')[-1] == filename:
-                            return zip_path, name
-        return None
-
     def _parse_trans_path(self, full_path: str) -> list:
         """
         Return directory entries for the given virtual path, using get_source_path for translation.
         Supports dynamic expansion of ...SoftwareArchives... maps, including subfolders and zip logic.
         """
-        path = Path(full_path)
-        root_parts = Path(self.root).parts
-        lev = len(path.parts) - len(root_parts)
+        rel_parts = self._rel_parts(full_path)
+        lev = len(rel_parts)
 
         if lev == 0:
             return self._list_clients()
         if lev == 1:
-            return self._list_systems(path, root_parts)
+            return self._list_systems(rel_parts)
+        if lev == 2:
+            return self._list_maps(rel_parts)
+        return self._list_dynamic_or_regular(rel_parts)
+
+    def _parse_trans_path_contains(self, full_path: str, name: str) -> bool:
+        """
+        Check whether name is an entry of the virtual directory full_path.
+        Client, system and map levels are answered straight from the config
+        without building the listing; deeper levels fall back to _parse_trans_path.
+        """
+        rel_parts = self._rel_parts(full_path)
+        lev = len(rel_parts)
+
+        if lev == 0:
+            return self._client_exists(name)
+        if lev == 1:
+            return self._get_system(rel_parts[0], name) is not None
         if lev == 2:
-            return self._list_maps(path, root_parts)
-        return self._list_dynamic_or_regular(path, root_parts)
+            return name in self._list_maps(rel_parts)
+        return name in self._parse_trans_path_cached(full_path)
+
+    def _parse_trans_path_cached(self, full_path: str) -> frozenset:
+        """
+        Return the virtual entries of full_path as a frozenset, reusing a
+        listing built within the last _LISTING_TTL seconds.
+        """
+        entries = self._listing_cache.get(full_path)
+        if entries is None:
+            generation = self._cache_generation
+            entries = frozenset(self._parse_trans_path(full_path))
+            self._cache_put(self._listing_cache, full_path, entries, generation)
+        return entries
+
+    def _cached_source_path(self, full_path: str) -> Optional[Any]:
+        """
+        get_source_path() for the FUSE ops, reusing a result resolved within the
+        last _LISTING_TTL seconds so repeated lookups skip the per-candidate stats.
+        """
+        source = self._source_cache.get(full_path)
+        if source is None:
+            generation = self._cache_generation
+            source = self.get_source_path(full_path)
+            self._cache_put(self._source_cache, full_path, _NO_SOURCE if source is None else source, generation)
+            return source
+        return None if source is _NO_SOURCE else source
+
+    def _cache_put(self, cache: TTLCache, key: str, value: Any, generation: int):
+        """Store value unless the caches were invalidated since generation was read."""
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                cache.put(key, value)
+
+    def _cache_attrs(self, full_path: str, attrs: dict, generation: int, stamp: Optional[int]):
+        """
+        Store attrs like _cache_put, additionally skipping them if full_path was
+        written to or had its metadata changed since stamp was read.
+        """
+        with self._cache_lock:
+            if generation == self._cache_generation and self._forgotten.get(full_path) == stamp:
+                self._attr_cache.put(full_path, attrs)
+
+    def _invalidate_caches(self):
+        """Drop cached listings, resolved paths and attributes after anything changes the real namespace."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._listing_cache.clear()
+            self._dir_cache.clear()
+            self._source_cache.clear()
+            self._attr_cache.clear()
+            self._missing_cache.clear()
+
+    def _forget_attrs(self, path: str):
+        """Drop the cached attributes of one FUSE path after its data or metadata changed."""
+        full_path = self._full_path(path)
+        with self._cache_lock:
+            self._forget_count += 1
+            self._forgotten.put(full_path, self._forget_count)
+            self._attr_cache.pop(full_path)
 
     def _list_clients(self) -> list:
         """List all clients."""
         return [client['name'] for client in self.config['clients']]
 
-    def _list_systems(self, path: Path, root_parts: tuple) -> list:
+    def _list_systems(self, rel_parts: tuple) -> list:
         """List all systems for a client."""
-        client_name = path.parts[len(root_parts)]
-        client = next((c for c in self.config['clients'] if c['name'] == client_name), None)
+        client = self._clients_by_name.get(rel_parts[0])
         if not client:
             return []
         return [system['name'] for system in client['systems']]
 
-    def _list_maps(self, path: Path, root_parts: tuple) -> list:
+    def _list_maps(self, rel_parts: tuple) -> list:
         """List all maps and dynamic SoftwareArchives for a system."""
-        client_name = path.parts[len(root_parts)]
-        client = next((c for c in self.config['clients'] if c['name'] == client_name), None)
-        if not client:
-            return []
-        system_name = path.parts[len(root_parts) + 1]
-        system = next((s for s in client['systems'] if s['name'] == system_name), None)
+        system = self._get_system(rel_parts[0], rel_parts[1])
         if not system:
             return []
         maps = []
@@ -182,21 +331,16 @@ class TransFS(Passthrough):
                 maps.append(map_name)
         return maps
 
-    def _list_dynamic_or_regular(self, path: Path, root_parts: tuple) -> list:
+    def _list_dynamic_or_regular(self, rel_parts: tuple) -> list:
         """List dynamic SoftwareArchives subfolders and their contents, or regular map subfolders."""
-        client_name = path.parts[len(root_parts)]
-        client = next((c for c in self.config['clients'] if c['name'] == client_name), None)
-        if not client:
-            return []
-        system_name = path.parts[len(root_parts) + 1]
-        system = next((s for s in client['systems'] if s['name'] == system_name), None)
+        system = self._get_system(rel_parts[0], rel_parts[1])
         if not system:
             return []
-        map_name = path.parts[len(root_parts) + 2]
+        map_name = rel_parts[2]
         sa_entry = self._find_software_archive_entry(system)
         if sa_entry and self._is_dynamic_map(map_name, sa_entry):
-            return self._list_dynamic_map(path, root_parts, system, sa_entry, map_name)
-        return self._list_regular_map(path, root_parts, system, map_name)
+            return self._list_dynamic_map(rel_parts, system, sa_entry, map_name)
+        return self._list_regular_map(rel_parts, system, map_name)
 
     def _is_dynamic_map(self, map_name: str, sa_entry: dict) -> bool:
         """Check if the map is a dynamic ...SoftwareArchives... map."""
@@ -207,7 +351,7 @@ class TransFS(Passthrough):
         return False
 
     def _list_dynamic_map(
-        self, path: Path, root_parts: tuple, system: dict, sa_entry: dict, map_name: str
+        self, rel_parts: tuple, system: dict, sa_entry: dict, map_name: str
     ) -> list:
         """
         List files and directories for a dynamic ...SoftwareArchives... map,
@@ -223,33 +367,35 @@ class TransFS(Passthrough):
         )
         filetype_map, reverse_map = self._get_filetype_maps(sa_entry)
         real_exts = filetype_map.get(map_name.upper(), [])
-        subpath = path.parts[len(root_parts) + 3:]
+        subpath = rel_parts[3:]
         entries = set()
         for real_ext in real_exts:
             dir_path = os.path.join(source_dir, real_ext, *subpath)
-            if os.path.isdir(dir_path):
-                for entry in os.listdir(dir_path):
+            real_upper = real_ext.upper()
+            # Suffix every listed file in this folder gets, built once per folder
+            virt_suffix = '.' + reverse_map.get(real_upper, real_upper).lower()
+            try:
+                scanner = os.scandir(dir_path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with scanner:
+                for dirent in scanner:
+                    entry = dirent.name
                     if entry.startswith('.'):
                         continue
-                    entry_path = os.path.join(dir_path, entry)
                     # Handle directories
-                    if os.path.isdir(entry_path):
+                    if dirent.is_dir():
                         entries.add(entry)
                     # Handle zip files
                     elif entry.lower().endswith('.zip'):
                         try:
-                            namelist = self._list_zip_file(entry_path)
                             # Only files with the correct extension (case-insensitive)
-                            filtered = [
-                                n for n in namelist
-                                if n.upper().endswith(f".{real_ext.upper()}")
-                            ]
+                            filtered = get_zip_index(dirent.path).names_with_ext(real_ext)
                             if len(filtered) == 1:
                                 # Flatten: show the file directly in this folder
                                 zname = filtered[0]
                                 name, ext = os.path.splitext(os.path.basename(zname))
-                                virt_ext = reverse_map.get(real_ext.upper(), real_ext.upper())
-                                entries.add(f"{name}.{virt_ext.lower()}")
+                                entries.add(name + virt_suffix)
                             elif len(filtered) > 1:
                                 # Show the zip as a folder
                                 entries.add(entry)
@@ -259,48 +405,11 @@ class TransFS(Passthrough):
                     else:
                         # Regular file: check extension case-insensitively
                         name, ext = os.path.splitext(entry)
-                        if ext[1:].upper() == real_ext.upper():
-                            virt_ext = reverse_map.get(real_ext.upper(), real_ext.upper())
-                            entries.add(f"{name}.{virt_ext.lower()}")
-        return sorted(entries)
+                        if ext[1:].upper() == real_upper:
+                            entries.add(name + virt_suffix)
+        return list(entries)
 
-    def _list_dir_with_zip(self, dir_path: str, supports_zip: bool) -> set:
-        """List directory contents, handling zip-as-folder logic if needed."""
-        entries = set()
-        if os.path.isdir(dir_path):
-            for entry in os.listdir(dir_path):
-                entry_path = os.path.join(dir_path, entry)
-                if (
-                    entry.lower().endswith('.zip')
-                    and not supports_zip
-                ):
-                    try:
-                        namelist = self._list_zip_file(entry_path)
-                        if len(namelist) == 1:
-                            entries.add(namelist[0].split('/')[-1])
-                        elif len(namelist) > 1:
-                            entries.add(entry)
-                    except zipfile.BadZipFile:
-                        entries.add(entry)
-                else:
-                    entries.add(entry)
-        elif (
-            os.path.isfile(dir_path)
-            and dir_path.lower().endswith('.zip')
-            and not supports_zip
-        ):
-            try:
-                namelist = self._list_zip_file(dir_path)
-                if len(namelist) == 1:
-                    entries.add(namelist[0].split('/')[-1])
-                else:
-                    for name in namelist:
-                        entries.add(name.split('/')[-1])
-            except zipfile.BadZipFile:
-                pass
-        return entries
-
-    def _list_regular_map(self, path: Path, root_parts: tuple, system: dict, map_name: str) -> list:
+    def _list_regular_map(self, rel_parts: tuple, system: dict, map_name: str) -> list:
         """List contents of a regular map subfolder."""
         map_entry = next((m for m in system['maps'] if list(m.keys())[0] == map_name), None)
         if not map_entry:
@@ -313,10 +422,10 @@ class TransFS(Passthrough):
                 system['local_base_path'],
                 mapdict["source_dir"]
             )
-            subpath = path.parts[len(root_parts) + 3:]
+            subpath = rel_parts[3:]
             dir_path = os.path.join(base, *subpath)
             if os.path.isdir(dir_path):
-                return sorted(os.listdir(dir_path))
+                return os.listdir(dir_path)
         return []
 
     def get_source_path(self, translated_path: str) -> Optional[Any]:
@@ -325,9 +434,7 @@ class TransFS(Passthrough):
         source path in the filestore, using the translation logic from TransFS.
         Supports dynamic ...SoftwareArchives... mapping, including zip-as-folder logic and filetype mapping.
         """
-        path = Path(translated_path)
-        root_parts = Path(self.root).parts
-        rel_parts = path.parts[len(root_parts):]
+        rel_parts = self._rel_parts(translated_path)
 
         if not rel_parts:
             return self.config.get("filestore", "/mnt/filestorefs")
@@ -339,7 +446,7 @@ class TransFS(Passthrough):
         if len(rel_parts) == 1:
             return self.config.get("filestore", "/mnt/filestorefs")
 
-        path_template_parts = Path(client['default_target_path']).parts
+        path_template_parts = self._template_parts[client['name']]
         system_info = self._get_system_info(
             client, list(rel_parts), path_template_parts
         )
@@ -367,8 +474,7 @@ class TransFS(Passthrough):
 
     def _get_client(self, rel_parts: tuple) -> Optional[dict]:
         """Return the client dict for the given rel_parts."""
-        client_name = rel_parts[0]
-        return next((c for c in self.config.get('clients', []) if c['name'] == client_name), None)
+        return self._clients_by_name.get(rel_parts[0])
 
     def _get_dynamic_source_path(self, system_info: dict, rel_parts: tuple) -> Optional[Any]:
         """Handle ...SoftwareArchives... dynamic folders with zip logic and filetype mapping."""
@@ -417,14 +523,9 @@ class TransFS(Passthrough):
                 return real_path
             # Check for file in zip files in the real_ext directory
             parent_dir = os.path.join(source_dir, real_ext, *subpath[:-1])
-            if os.path.isdir(parent_dir):
-                for entry in os.listdir(parent_dir):
-                    if entry.lower().endswith('.zip'):
-                        zip_path = os.path.join(parent_dir, entry)
-                        with zipfile.ZipFile(zip_path, 'r') as zf:
-                            for zname in zf.namelist():
-                                if zname.split('/')[-1] == real_filename:
-                                    return (zip_path, zname)
+            in_zip = find_in_dir_zips(parent_dir, real_filename)
+            if in_zip is not None:
+                return in_zip
         return None
 
     def _get_regular_source_path(self, system_info: dict, rel_parts: tuple) -> Optional[Any]:
@@ -474,16 +575,52 @@ class TransFS(Passthrough):
         return None
 
     def readdir(self, path: str, fh: int):
-        """FUSE readdir implementation."""
+        """FUSE readdir implementation, reusing a listing built within the last _LISTING_TTL seconds."""
         full_path = self._full_path(path)
-        dirents = ['.', '..']
-        dirents.extend(self._parse_trans_path(full_path))
-        if os.path.isdir(full_path):
-            dirents.extend(os.listdir(full_path))
+        dirents = self._dir_cache.get(full_path)
+        if dirents is None:
+            generation = self._cache_generation
+            dirents = ['.', '..']
+            rel_parts = self._rel_parts(full_path)
+            # Only the root and client subtrees have virtual entries
+            if not rel_parts or self._client_exists(rel_parts[0]):
+                dirents.extend(self._parse_trans_path_cached(full_path))
+            if os.path.isdir(full_path):
+                dirents.extend(self._scan_real_dir(full_path, rel_parts, generation))
+            dirents = tuple(dirents)
+            self._cache_put(self._dir_cache, full_path, dirents, generation)
         for entry in dirents:
             yield entry
 
 
+    def _scan_real_dir(self, full_path: str, rel_parts: tuple, generation: int) -> list:
+        """
+        List a real folder with os.scandir. Entries the config can't remap (their
+        first path component isn't a client) get their lstat stored in the attr
+        cache, so the getattr that follows each readdir entry is a cache hit.
+        At most half the cache is pre-filled per listing; past that, a huge folder
+        would only evict its own first entries before their getattr arrives.
+        """
+        remapped = bool(rel_parts) and self._client_exists(rel_parts[0])
+        prefill_left = self._attr_cache.maxsize // 2
+        names = []
+        with os.scandir(full_path) as scanner:
+            for dirent in scanner:
+                names.append(dirent.name)
+                if not prefill_left or remapped or (not rel_parts and self._client_exists(dirent.name)):
+                    continue
+                # Anything else falls through _is_virtual_path in getattr; leave it to that
+                if not (dirent.is_dir() or dirent.is_file()):
+                    continue
+                try:
+                    st = dirent.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                # Files written to recently are left for getattr, which checks their stamp
+                self._cache_attrs(dirent.path, _stat_to_attrs(st), generation, None)
+                prefill_left -= 1
+        return names
+
     def getattr(
         self,
         path: str,
@@ -491,84 +628,151 @@ class TransFS(Passthrough):
     ) -> dict[
         Literal[
             'st_atime', 'st_ctime', 'st_gid', 'st_mode', 'st_mtime',
-            'st_nlink', 'st_size', 'st_uid'
+            'st_nlink', 'st_size', 'st_uid', 'st_blksize', 'st_blocks'
         ],
         int
     ]:
-        """FUSE getattr implementation."""
+        """FUSE getattr implementation, reusing attributes fetched within the last _LISTING_TTL seconds."""
         full_path = self._full_path(path)
-        fspath = self.get_source_path(full_path)
+        attrs = self._attr_cache.get(full_path)
+        if attrs is None:
+            if self._missing_cache.get(full_path):
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), full_path)
+            generation = self._cache_generation
+            stamp = self._forgotten.get(full_path)
+            try:
+                attrs = self._lookup_attrs(full_path)
+            except FileNotFoundError:
+                self._cache_put(self._missing_cache, full_path, True, generation)
+                raise
+            self._cache_attrs(full_path, attrs, generation, stamp)
+        return attrs
+
+    def _lookup_attrs(self, full_path: str) -> dict:
+        """Build the getattr dict for full_path from the filestore, zip index or virtual tree."""
+        fspath = self._cached_source_path(full_path)
 
         if fspath is None:
             # If this is a known virtual directory, return a fake stat for a directory
             if self._is_virtual_path(full_path):
-                now = int(time.time())
-                return {
-                    'st_atime': now,
-                    'st_ctime': now,
-                    'st_mtime': now,
-                    'st_gid': 0,
-                    'st_uid': 0,
-                    'st_mode': 0o040755,  # directory
-                    'st_nlink': 2,
-                    'st_size': 4096,
-                }
+                return self._virtual_dir_attrs
             # Otherwise, fallback to real stat (will raise FileNotFoundError if missing)
             st = os.lstat(full_path)
-            keys = (
-                'st_atime', 'st_ctime', 'st_gid', 'st_mode', 'st_mtime',
-                'st_nlink', 'st_size', 'st_uid'
-            )
-            return {key: int(getattr(st, key)) for key in keys}
+            return _stat_to_attrs(st)
 
         if isinstance(fspath, tuple):
             # (zip_path, internal_file)
             zip_path, internal_file = fspath
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                info = zf.getinfo(internal_file)
-                class StatObj:
-                    st_atime = st_mtime = st_ctime = int(os.path.getmtime(zip_path))
-                    st_gid = 0
-                    st_uid = 0
-                    st_mode = 0o100444  # regular file, read-only
-                    st_nlink = 1
-                    st_size = info.file_size
-                st = StatObj()
-        else:
-            st = os.lstat(fspath)
+            idx = get_zip_index(zip_path)
+            attrs = _ZIP_FILE_ATTRS.copy()
+            attrs['st_atime'] = attrs['st_ctime'] = attrs['st_mtime'] = idx.mtime_ns // 1_000_000_000
+            attrs['st_size'] = idx.file_size(internal_file)
+            attrs['st_blocks'] = (attrs['st_size'] + 511) // 512
+            return attrs
 
-        keys = (
-            'st_atime', 'st_ctime', 'st_gid', 'st_mode', 'st_mtime',
-            'st_nlink', 'st_size', 'st_uid'
-        )
-        return {key: int(getattr(st, key)) for key in keys}
+        st = os.lstat(fspath)
+        return _stat_to_attrs(st)
 
     def open(self, path: str, flags: int) -> int:
         """FUSE open implementation."""
         full_path = self._full_path(path)
-        trans_path = self.get_source_path(full_path)
+        trans_path = self._cached_source_path(full_path)
         if trans_path is None:
             return os.open(full_path, flags)
         if isinstance(trans_path, tuple):
             zip_path, internal_file = trans_path
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                temp = tempfile.NamedTemporaryFile(delete=False)
-                temp.write(zf.read(internal_file))
-                temp.close()
-                return os.open(temp.name, flags)
+            return open_member(zip_path, internal_file, flags)
         return os.open(trans_path, flags)
 
+    # --- Write paths: anything that changes an entry's data or metadata ---
+
+    def chmod(self, path, mode):  # type: ignore
+        result = super().chmod(path, mode)
+        self._forget_attrs(path)
+        return result
+
+    def chown(self, path, uid, gid):
+        result = super().chown(path, uid, gid)
+        self._forget_attrs(path)
+        return result
+
+    def utimens(self, path, times=None):  # type: ignore
+        result = super().utimens(path, times)
+        self._forget_attrs(path)
+        return result
+
+    def write(self, path, buf, offset, fh):  # type: ignore
+        result = super().write(path, buf, offset, fh)
+        self._forget_attrs(path)
+        return result
+
+    def truncate(self, path, length, fh=None):  # type: ignore
+        result = super().truncate(path, length, fh)
+        self._forget_attrs(path)
+        return result
+
+    # --- Write paths: anything that adds, removes or renames entries ---
+
+    def create(self, path, mode, fi=None):  # type: ignore
+        fd = super().create(path, mode, fi)
+        self._invalidate_caches()
+        return fd
+
+    def mknod(self, path, mode, dev):
+        result = super().mknod(path, mode, dev)
+        self._invalidate_caches()
+        return result
+
+    def mkdir(self, path, mode):  # type: ignore
+        result = super().mkdir(path, mode)
+        self._invalidate_caches()
+        return result
+
+    def rmdir(self, path):  # type: ignore
+        result = super().rmdir(path)
+        self._invalidate_caches()
+        return result
+
+    def unlink(self, path):  # type: ignore
+        result = super().unlink(path)
+        self._invalidate_caches()
+        return result
+
+    def symlink(self, name, target):  # type: ignore
+        result = super().symlink(name, target)
+        self._invalidate_caches()
+        return result
+
+    def rename(self, old, new):  # type: ignore
+        result = super().rename(old, new)
+        self._invalidate_caches()
+        return result
+
+    def link(self, target, name):  # type: ignore
+        result = super().link(target, name)
+        self._invalidate_caches()
+        return result
+
 
 def main(mount_path: str, root_path: str):
     """Mount the FUSE filesystem."""
     FUSE(
         TransFS(root_path=root_path),
         mount_path,
-        nothreads=True,
+        # getattr/readdir/read are safe to run concurrently; the caches and zip pools lock internally
+        nothreads=False,
         foreground=True,
-        debug=True,
+        # fusepy's debug mode logs every operation; only pay for it when asked
+        debug=os.environ.get("TRANSFS_DEBUG", "") == "1",
         encoding='utf-8',
-        allow_other=True
+        allow_other=True,
+        # Let the kernel cache lookups, attributes and misses for as long as our own caches do
+        entry_timeout=_LISTING_TTL,
+        attr_timeout=_LISTING_TTL,
+        negative_timeout=_LISTING_TTL,
+        # Keep page cache across opens while a file's mtime/size are unchanged
+        auto_cache=True,
+        max_readahead=128 * 1024,
     )
 
 
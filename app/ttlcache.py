@@ -0,0 +1,57 @@
+""" Small time-bounded cache used by TransFS for listings and attributes """
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Cache whose entries expire ttl seconds after they were stored. Thread-safe.
+    The ttl is the same for every entry, so insertion order is expiry order and
+    both expiry and eviction only ever touch the front of the OrderedDict.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                self._data.pop(key, None)
+                return default
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, dropping expired entries and then the oldest when full."""
+        now = time.monotonic()
+        with self._lock:
+            # Re-inserting moves the key to the back, keeping the dict in expiry order
+            self._data.pop(key, None)
+            while self._data:
+                expires, _ = next(iter(self._data.values()))
+                if expires >= now and len(self._data) < self.maxsize:
+                    break
+                self._data.popitem(last=False)
+            self._data[key] = (now + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,432 @@
+""" Cached index of zip archive contents, rebuilt when the archive changes """
+import atexit
+import mmap
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+import zipfile
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from ttlcache import TTLCache
+
+# Seconds a cached index is trusted before its archive's mtime is checked again
+_INDEX_RECHECK_INTERVAL = 1.0
+# Members (plus one per archive) across the indexes kept in memory. Bounding by
+# members rather than archives keeps a folder of thousands of small zips cached
+# whole; an LRU smaller than the folder would miss on every re-list
+_ZIP_INDEX_CACHE_MEMBERS = 500_000
+# Upper bound on how long a directory's member map can miss an in-place zip rewrite
+_DIR_MEMBERS_TTL = 2.0
+# Open ZipFile handles kept per archive, and archives kept in the pool
+_ZIPFILE_POOL_SIZE = 4
+_ZIPFILE_POOL_ARCHIVES = 32
+# Largest chunk decompressed per read when extracting a compressed member
+_EXTRACT_CHUNK = 1024 * 1024
+# Extracted members kept on disk for later read-only opens
+_EXTRACTED_MAX_FILES = 64
+_EXTRACTED_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ZipIndex:
+    """Files (not directories) held in one zip archive, with their sizes."""
+
+    __slots__ = ("zip_path", "mtime_ns", "_pos", "_names", "_sizes", "_offsets", "_by_basename", "_by_ext")
+
+    def __init__(
+        self, zip_path: str, mtime_ns: int, names: List[str], sizes: array, offsets: array
+    ):
+        self.zip_path = zip_path
+        self.mtime_ns = mtime_ns
+        # Sizes and offsets stay in the packed arrays; one dict maps each file to its slot
+        self._sizes = sizes
+        self._offsets = offsets
+        self._pos: Dict[str, int] = {}
+        self._by_basename: Dict[str, str] = {}
+        by_ext: Dict[str, list] = {}
+        for i, name in enumerate(names):
+            if name.endswith('/'):
+                continue
+            self._pos[name] = i
+            # First match in archive order wins, as the old namelist scans did
+            self._by_basename.setdefault(name.split('/')[-1], name)
+            if '.' in name:
+                by_ext.setdefault(name.rpartition('.')[2].upper(), []).append(name)
+        self._names = tuple(self._pos)
+        self._by_ext: Dict[str, tuple] = {ext: tuple(names) for ext, names in by_ext.items()}
+
+    def namelist(self) -> tuple:
+        """Return the archive's file names in archive order."""
+        return self._names
+
+    def names_with_ext(self, ext: str) -> tuple:
+        """Return the file names ending in .ext (case-insensitive), in archive order."""
+        return self._by_ext.get(ext.upper(), ())
+
+    def find(self, basename: str) -> Optional[str]:
+        """Return the full name of the first file called basename, if any."""
+        return self._by_basename.get(basename)
+
+    def file_size(self, name: str) -> int:
+        """Return the uncompressed size of the named file."""
+        return self._sizes[self._pos[name]]
+
+    def stored_offset(self, name: str) -> Optional[int]:
+        """Return the local header offset of an uncompressed, unencrypted member, else None."""
+        offset = self._offsets[self._pos[name]]
+        return offset if offset >= 0 else None
+
+
+_EOCD = struct.Struct('<4s4H2LH')
+_EOCD_SIG = b'PK\x05\x06'
+_EOCD64_LOCATOR = struct.Struct('<4sLQL')
+_EOCD64_LOCATOR_SIG = b'PK\x06\x07'
+_EOCD64 = struct.Struct('<4sQ2H2L4Q')
+_EOCD64_SIG = b'PK\x06\x06'
+_ZIP64_EXTRA_ID = 0x0001
+_CDH = struct.Struct('<4s4B4HL2L5H2L')
+_CDH_SIG = b'PK\x01\x02'
+_LFH = struct.Struct('<4s2B4HL2L2H')
+_LFH_SIG = b'PK\x03\x04'
+_ENCRYPTED_FLAG = 0x1
+_UTF8_FLAG = 0x800
+
+
+def _zip64_extra(extra: bytes, wanted: int) -> Tuple[int, ...]:
+    """Return the first `wanted` 64-bit values from a Zip64 extended information field."""
+    pos = 0
+    while pos + 4 <= len(extra):
+        tag, length = struct.unpack_from('<2H', extra, pos)
+        if tag == _ZIP64_EXTRA_ID:
+            if length < 8 * wanted:
+                raise ValueError("short Zip64 extra field")
+            return struct.unpack_from(f'<{wanted}Q', extra, pos + 4)
+        pos += 4 + length
+    raise ValueError("missing Zip64 extra field")
+
+
+def _read_central_directory(zip_path: str) -> Tuple[List[str], array, array]:
+    """
+    Return the names, sizes and stored-member header offsets (-1 when the
+    member is compressed or encrypted) of every entry as parallel arrays,
+    read from the central directory without building a ZipInfo per entry.
+    Zip64 archives are followed through their locator. Raises ValueError for
+    anything it doesn't handle (e.g. multi-disk archives) so the caller can
+    fall back to zipfile.
+    """
+    with open(zip_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        tail_len = min(file_size, _EOCD.size + 0xFFFF)
+        tail_start = file_size - tail_len
+        f.seek(tail_start)
+        tail = f.read(tail_len)
+        pos = tail.rfind(_EOCD_SIG)
+        if pos < 0 or pos + _EOCD.size > len(tail):
+            raise ValueError("no end of central directory record")
+        _, _, _, _, count, cd_size, cd_offset, _ = _EOCD.unpack_from(tail, pos)
+        eocd_start = tail_start + pos
+        if pos >= _EOCD64_LOCATOR.size and tail.startswith(
+            _EOCD64_LOCATOR_SIG, pos - _EOCD64_LOCATOR.size
+        ):
+            _, _, _, disks = _EOCD64_LOCATOR.unpack_from(tail, pos - _EOCD64_LOCATOR.size)
+            if disks > 1:
+                raise ValueError("multi-disk archive")
+            # As zipfile does, assume the Zip64 record sits right before its locator
+            eocd_start -= _EOCD64_LOCATOR.size + _EOCD64.size
+            if eocd_start < 0:
+                raise ValueError("bad Zip64 end of central directory")
+            f.seek(eocd_start)
+            record = f.read(_EOCD64.size)
+            if len(record) < _EOCD64.size or not record.startswith(_EOCD64_SIG):
+                raise ValueError("bad Zip64 end of central directory")
+            _, _, _, _, _, _, _, count, cd_size, cd_offset = _EOCD64.unpack(record)
+        elif 0xFFFF == count or 0xFFFFFFFF in (cd_size, cd_offset):
+            raise ValueError("Zip64 sizes without a Zip64 locator")
+        # Anything prepended to the archive (e.g. a self-extractor stub) shifts every offset
+        concat = eocd_start - cd_size - cd_offset
+        if concat < 0:
+            raise ValueError("bad central directory offset")
+        f.seek(cd_offset + concat)
+        buf = f.read(cd_size)
+
+    names: List[str] = []
+    sizes = array('Q')
+    offsets = array('q')
+    offset = 0
+    for _ in range(count):
+        fields = _CDH.unpack_from(buf, offset)
+        if fields[0] != _CDH_SIG:
+            raise ValueError("bad central directory header")
+        flags, compress_type, size = fields[5], fields[6], fields[11]
+        name_len, extra_len, comment_len = fields[12], fields[13], fields[14]
+        header_offset = fields[18]
+        start = offset + _CDH.size
+        if 0xFFFFFFFF in (size, header_offset):
+            # The extra field holds, in order, only the values whose 32-bit slot overflowed
+            extra = buf[start + name_len:start + name_len + extra_len]
+            overflowed = [v == 0xFFFFFFFF for v in (size, fields[10], header_offset)]
+            values = list(_zip64_extra(extra, sum(overflowed)))
+            if overflowed[0]:
+                size = values.pop(0)
+            if overflowed[1]:
+                values.pop(0)
+            if overflowed[2]:
+                header_offset = values.pop(0)
+        raw = buf[start:start + name_len]
+        name = raw.decode('utf-8') if flags & _UTF8_FLAG else raw.decode('cp437')
+        names.append(name)
+        sizes.append(size)
+        if compress_type == zipfile.ZIP_STORED and not flags & _ENCRYPTED_FLAG:
+            offsets.append(header_offset + concat)
+        else:
+            offsets.append(-1)
+        offset = start + name_len + extra_len + comment_len
+    return names, sizes, offsets
+
+
+# zip_path -> (index, monotonic time its mtime was last checked), least recently used first
+_zip_index_cache: "OrderedDict[str, Tuple[ZipIndex, float]]" = OrderedDict()
+_zip_index_members = 0
+# Guards _zip_index_cache bookkeeping only; indexes are built outside it
+_index_lock = threading.Lock()
+
+
+def _index_weight(idx: ZipIndex) -> int:
+    """Share of _ZIP_INDEX_CACHE_MEMBERS idx takes; empty archives still count once."""
+    return len(idx.namelist()) + 1
+
+
+def _store_index(zip_path: str, idx: ZipIndex, checked: float) -> None:
+    """Cache idx as most recently used, evicting the oldest until under _ZIP_INDEX_CACHE_MEMBERS. Call with _index_lock held."""
+    global _zip_index_members
+    old = _zip_index_cache.pop(zip_path, None)
+    if old is not None:
+        _zip_index_members -= _index_weight(old[0])
+    _zip_index_cache[zip_path] = (idx, checked)
+    _zip_index_members += _index_weight(idx)
+    while _zip_index_members > _ZIP_INDEX_CACHE_MEMBERS and len(_zip_index_cache) > 1:
+        evicted, _ = _zip_index_cache.popitem(last=False)[1]
+        _zip_index_members -= _index_weight(evicted)
+
+
+def get_zip_index(zip_path: str) -> ZipIndex:
+    """
+    Return the index for zip_path, building it on first use or when the
+    archive's mtime has changed. The mtime is rechecked at most once per
+    _INDEX_RECHECK_INTERVAL. Raises zipfile.BadZipFile for bad archives.
+    Two threads missing on the same archive may both build it; the last one wins.
+    """
+    now = time.monotonic()
+    with _index_lock:
+        cached = _zip_index_cache.get(zip_path)
+        if cached is not None:
+            _zip_index_cache.move_to_end(zip_path)
+            if now - cached[1] < _INDEX_RECHECK_INTERVAL:
+                return cached[0]
+    mtime_ns = os.stat(zip_path).st_mtime_ns
+    if cached is not None and cached[0].mtime_ns == mtime_ns:
+        with _index_lock:
+            _store_index(zip_path, cached[0], now)
+        return cached[0]
+    try:
+        names, sizes, offsets = _read_central_directory(zip_path)
+    except (ValueError, struct.error):
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            infos = zf.infolist()
+        names = [info.filename for info in infos]
+        sizes = array('Q', [info.file_size for info in infos])
+        offsets = array('q', [
+            info.header_offset
+            if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & _ENCRYPTED_FLAG
+            else -1
+            for info in infos
+        ])
+    idx = ZipIndex(zip_path, mtime_ns, names, sizes, offsets)
+    with _index_lock:
+        _store_index(zip_path, idx, now)
+    return idx
+
+
+_zipfile_pool: Dict[str, Tuple[int, queue.LifoQueue]] = {}
+_pool_lock = threading.Lock()
+
+
+def _close_pooled(handles: queue.LifoQueue) -> None:
+    """Close every ZipFile left in a pool queue."""
+    while True:
+        try:
+            handles.get_nowait().close()
+        except queue.Empty:
+            return
+
+
+def _acquire_zipfile(idx: ZipIndex) -> zipfile.ZipFile:
+    """Return a pooled ZipFile for idx's archive, opening one if none is free."""
+    with _pool_lock:
+        pooled = _zipfile_pool.get(idx.zip_path)
+    if pooled is not None and pooled[0] == idx.mtime_ns:
+        try:
+            return pooled[1].get_nowait()
+        except queue.Empty:
+            pass
+    return zipfile.ZipFile(idx.zip_path, 'r')
+
+
+def _release_zipfile(idx: ZipIndex, zf: zipfile.ZipFile) -> None:
+    """Return zf to the pool, closing it if the pool is full or the archive changed."""
+    with _pool_lock:
+        pooled = _zipfile_pool.get(idx.zip_path)
+        if pooled is None or pooled[0] != idx.mtime_ns:
+            if pooled is not None:
+                _close_pooled(pooled[1])
+            elif len(_zipfile_pool) >= _ZIPFILE_POOL_ARCHIVES:
+                _close_pooled(_zipfile_pool.pop(next(iter(_zipfile_pool)))[1])
+            pooled = (idx.mtime_ns, queue.LifoQueue(maxsize=_ZIPFILE_POOL_SIZE))
+            _zipfile_pool[idx.zip_path] = pooled
+    try:
+        pooled[1].put_nowait(zf)
+    except queue.Full:
+        zf.close()
+
+
+def extract_member(zip_path: str, name: str, dest: BinaryIO) -> None:
+    """
+    Write the uncompressed contents of member name to dest. Stored members
+    are copied straight out of an mmap of the archive; anything else goes
+    through a pooled ZipFile.
+    """
+    idx = get_zip_index(zip_path)
+    header_offset = idx.stored_offset(name)
+    if header_offset is None:
+        chunk = min(max(idx.file_size(name), 1), _EXTRACT_CHUNK)
+        zf = _acquire_zipfile(idx)
+        try:
+            with zf.open(name) as src:
+                shutil.copyfileobj(src, dest, chunk)
+        finally:
+            _release_zipfile(idx, zf)
+        return
+    size = idx.file_size(name)
+    with open(zip_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        fields = _LFH.unpack_from(mm, header_offset)
+        if fields[0] != _LFH_SIG:
+            raise zipfile.BadZipFile(f"Bad local file header for {name} in {zip_path}")
+        start = header_offset + _LFH.size + fields[10] + fields[11]
+        with memoryview(mm) as view:
+            dest.write(view[start:start + size])
+
+
+# (zip_path, member) -> (archive mtime_ns, temp path, size), least recently used first
+_extracted: "OrderedDict[Tuple[str, str], Tuple[int, str, int]]" = OrderedDict()
+_extracted_bytes = 0
+_extracted_lock = threading.Lock()
+# Per-process folder holding every extracted copy, removed when the process exits
+_extract_dir: Optional[str] = None
+
+
+def _get_extract_dir() -> str:
+    """Return this process's extraction folder, creating it on first use."""
+    global _extract_dir
+    with _extracted_lock:
+        if _extract_dir is None:
+            _extract_dir = tempfile.mkdtemp(prefix='transfs-')
+            atexit.register(shutil.rmtree, _extract_dir, ignore_errors=True)
+        return _extract_dir
+
+
+def _discard_extracted(entry: Tuple[int, str, int]) -> None:
+    """Delete an evicted copy; fds already open on it keep working."""
+    global _extracted_bytes
+    _extracted_bytes -= entry[2]
+    try:
+        os.unlink(entry[1])
+    except FileNotFoundError:
+        pass
+
+
+def open_member(zip_path: str, name: str, flags: int) -> int:
+    """
+    Return an fd for a temp file holding member name. Read-only opens share
+    one extracted copy per member, reused while the archive is unchanged and
+    evicted least recently used past _EXTRACTED_MAX_FILES/_EXTRACTED_MAX_BYTES.
+    Other opens get a private copy that is unlinked as soon as it is open.
+    """
+    global _extracted_bytes
+    idx = get_zip_index(zip_path)
+    shared = flags & os.O_ACCMODE == os.O_RDONLY
+    key = (zip_path, name)
+    if shared:
+        with _extracted_lock:
+            cached = _extracted.get(key)
+            if cached is not None and cached[0] == idx.mtime_ns:
+                _extracted.move_to_end(key)
+                return os.open(cached[1], flags)
+    with tempfile.NamedTemporaryFile(dir=_get_extract_dir(), delete=False) as temp:
+        try:
+            extract_member(zip_path, name, temp)
+        except BaseException:
+            temp.close()
+            os.unlink(temp.name)
+            raise
+    try:
+        fd = os.open(temp.name, flags)
+    except OSError:
+        os.unlink(temp.name)
+        raise
+    if not shared:
+        os.unlink(temp.name)
+        return fd
+    with _extracted_lock:
+        previous = _extracted.pop(key, None)
+        if previous is not None:
+            _discard_extracted(previous)
+        size = idx.file_size(name)
+        _extracted[key] = (idx.mtime_ns, temp.name, size)
+        _extracted_bytes += size
+        while _extracted and (
+            len(_extracted) > _EXTRACTED_MAX_FILES or _extracted_bytes > _EXTRACTED_MAX_BYTES
+        ):
+            _discard_extracted(_extracted.popitem(last=False)[1])
+    return fd
+
+
+_dir_members_cache = TTLCache(ttl=_DIR_MEMBERS_TTL, maxsize=1024)
+
+
+def _dir_zip_members(dir_path: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Map member basename -> (zip_path, member) across every zip in dir_path.
+    Reused while the directory's mtime is unchanged; unreadable zips are skipped.
+    """
+    mtime_ns = os.stat(dir_path).st_mtime_ns
+    cached = _dir_members_cache.get(dir_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    members: Dict[str, Tuple[str, str]] = {}
+    prefix = dir_path if dir_path.endswith('/') else dir_path + '/'
+    for entry in os.listdir(dir_path):
+        if not entry.lower().endswith('.zip'):
+            continue
+        zip_path = prefix + entry
+        try:
+            idx = get_zip_index(zip_path)
+        except (zipfile.BadZipFile, OSError):
+            continue
+        for name in idx.namelist():
+            members.setdefault(name.split('/')[-1], (zip_path, name))
+    _dir_members_cache.put(dir_path, (mtime_ns, members))
+    return members
+
+
+def find_in_dir_zips(dir_path: str, filename: str) -> Optional[Tuple[str, str]]:
+    """Return (zip_path, member) for the first zip in dir_path holding filename."""
+    try:
+        members = _dir_zip_members(dir_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return members.get(filename)
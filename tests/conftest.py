@@ -5,6 +5,15 @@ import time
 import subprocess
 import pytest
 
+def _stop(proc):
+    # A FUSE daemon stuck on a busy mount can ignore SIGTERM; don't hang the session on it
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
 @pytest.fixture(scope="session")
 def filestore_dir():
     # Create a temp filestore with sample data
@@ -26,8 +35,14 @@ def fuse_mount(tmp_path_factory, filestore_dir):
         "--mount", str(mount_dir),
         "--root", filestore_dir
     ])
-    # Wait for mount to be ready
-    time.sleep(2)
+    # Wait for mount to be ready, polling rather than sleeping a fixed time
+    deadline = time.monotonic() + 10
+    while not os.path.ismount(mount_dir):
+        if proc.poll() is not None:
+            pytest.fail(f"TransFS exited with code {proc.returncode} before mounting")
+        if time.monotonic() > deadline:
+            _stop(proc)
+            pytest.fail("TransFS did not mount within 10 seconds")
+        time.sleep(0.05)
     yield str(mount_dir)
-    proc.terminate()
-    proc.wait()
\ No newline at end of file
+    _stop(proc)
\ No newline at end of file
@@ -0,0 +1,102 @@
+import os
+import pytest
+from transfs import TransFS
+from ttlcache import TTLCache
+
+def test_source_path_cache_dropped_on_invalidate():
+    fs = TransFS("/tmp")
+    calls = []
+    fs.get_source_path = lambda p: calls.append(p)
+    assert fs._cached_source_path("/tmp/MiSTer/Missing") is None
+    assert fs._cached_source_path("/tmp/MiSTer/Missing") is None
+    assert len(calls) == 1
+    fs._invalidate_caches()
+    fs._cached_source_path("/tmp/MiSTer/Missing")
+    assert len(calls) == 2
+
+def test_attr_cache_dropped_on_truncate(tmp_path):
+    fs = TransFS(str(tmp_path))
+    (tmp_path / "notes.txt").write_text("hello")
+    assert fs.getattr("/notes.txt")["st_size"] == 5
+    fs.truncate("/notes.txt", 2)
+    assert fs.getattr("/notes.txt")["st_size"] == 2
+
+def test_readdir_prewarms_attr_cache(tmp_path):
+    fs = TransFS(str(tmp_path))
+    (tmp_path / "notes.txt").write_text("hello")
+    assert "notes.txt" in list(fs.readdir("/", None))
+    cached = fs._attr_cache.get(fs._full_path("/notes.txt"))
+    assert cached is not None and cached["st_size"] == 5
+    assert fs._attr_cache.get(fs._full_path("/MiSTer")) is None
+
+def test_missing_path_cached_until_create(tmp_path):
+    fs = TransFS(str(tmp_path))
+    for _ in range(2):
+        with pytest.raises(FileNotFoundError):
+            fs.getattr("/later.txt")
+    assert fs._missing_cache.get(fs._full_path("/later.txt"))
+    fd = fs.create("/later.txt", 0o644)
+    os.close(fd)
+    assert fs.getattr("/later.txt")["st_size"] == 0
+
+def test_miss_not_cached_when_create_races_lookup(tmp_path, monkeypatch):
+    fs = TransFS(str(tmp_path))
+    lookup_attrs = fs._lookup_attrs
+
+    def racing_lookup(full_path):
+        # Another thread creates the file after this lookup has already missed
+        try:
+            return lookup_attrs(full_path)
+        finally:
+            os.close(fs.create("/later.txt", 0o644))
+
+    monkeypatch.setattr(fs, "_lookup_attrs", racing_lookup)
+    with pytest.raises(FileNotFoundError):
+        fs.getattr("/later.txt")
+    assert fs._missing_cache.get(fs._full_path("/later.txt")) is None
+    monkeypatch.undo()
+    assert fs.getattr("/later.txt")["st_size"] == 0
+
+def test_readdir_larger_than_attr_cache(tmp_path):
+    fs = TransFS(str(tmp_path))
+    fs._attr_cache = TTLCache(ttl=60, maxsize=8)
+    (tmp_path / "roms").mkdir()
+    names = {f"rom{i}.bin" for i in range(20)}
+    for name in names:
+        (tmp_path / "roms" / name).write_text("x")
+    assert set(fs.readdir("/roms", None)) == names | {".", ".."}
+    # Only half the cache is pre-filled, so later getattrs don't evict each other's entries
+    assert len(fs._attr_cache) == 4
+    assert all(fs.getattr(f"/roms/{name}")["st_size"] == 1 for name in names)
+
+def test_write_elsewhere_does_not_block_readdir_caching(tmp_path, monkeypatch):
+    fs = TransFS(str(tmp_path))
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "game.uef").write_text("hello")
+    (tmp_path / "upload.bin").write_text("")
+    scan_real_dir = fs._scan_real_dir
+
+    def scan_during_upload(*args):
+        # Another client writes to an unrelated file while this listing is built
+        fs.truncate("/upload.bin", 4)
+        return scan_real_dir(*args)
+
+    monkeypatch.setattr(fs, "_scan_real_dir", scan_during_upload)
+    list(fs.readdir("/other", None))
+    assert fs._dir_cache.get(fs._full_path("/other")) is not None
+    assert fs._attr_cache.get(fs._full_path("/other/game.uef")) is not None
+
+def test_attrs_not_cached_when_truncate_races_lookup(tmp_path, monkeypatch):
+    fs = TransFS(str(tmp_path))
+    (tmp_path / "notes.txt").write_text("hello")
+    lookup_attrs = fs._lookup_attrs
+
+    def racing_lookup(full_path):
+        attrs = lookup_attrs(full_path)
+        fs.truncate("/notes.txt", 2)
+        return attrs
+
+    monkeypatch.setattr(fs, "_lookup_attrs", racing_lookup)
+    assert fs.getattr("/notes.txt")["st_size"] == 5
+    monkeypatch.undo()
+    assert fs.getattr("/notes.txt")["st_size"] == 2
@@ -10,4 +10,12 @@ def test_filetype_map_colon():
     fs = TransFS("/tmp")
     mapping, reverse = fs._parse_filetype_map({"ROM": "BIN:ROM, HEX:ROM"})
     assert mapping == {"ROM": ["BIN", "HEX"]}
-    assert reverse == {"BIN": "ROM", "HEX": "ROM"}
\ No newline at end of file
+    assert reverse == {"BIN": "ROM", "HEX": "ROM"}
+
+def test_contains_config_levels():
+    fs = TransFS("/tmp")
+    assert fs._parse_trans_path_contains("/tmp", "MiSTer")
+    assert fs._parse_trans_path_contains("/tmp/MiSTer", "AcornElectron")
+    assert not fs._parse_trans_path_contains("/tmp/MiSTer", "Bogus")
+    assert fs._parse_trans_path_contains("/tmp/MiSTer/AcornElectron", "Tapes")
+    assert not fs._parse_trans_path_contains("/tmp/MiSTer/AcornElectron", "ROMs")
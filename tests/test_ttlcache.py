@@ -0,0 +1,57 @@
+import time
+from collections import OrderedDict
+from ttlcache import TTLCache
+
+def test_get_put_and_expiry():
+    cache = TTLCache(ttl=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+def test_evicts_oldest_when_full():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2 and cache.get("c") == 3
+
+class _CountingDict(OrderedDict):
+    """OrderedDict that counts how many stored entries put() looks at or evicts."""
+
+    def __init__(self):
+        super().__init__()
+        self.touched = 0
+
+    def values(self):
+        for value in super().values():
+            self.touched += 1
+            yield value
+
+    def popitem(self, last=True):
+        self.touched += 1
+        return super().popitem(last)
+
+def test_eviction_stays_bounded_when_full():
+    cache = TTLCache(ttl=60, maxsize=4096)
+    cache._data = _CountingDict()
+    for i in range(4096):
+        cache.put(i, i)
+    for i in range(4096, 20000):
+        cache._data.touched = 0
+        cache.put(i, i)
+        # Peek the front, evict it, peek the new front; never a scan of the whole cache
+        assert cache._data.touched <= 3
+    assert len(cache) == 4096
+    assert cache.get(20000 - 4096) == 20000 - 4096
+    assert cache.get(20000 - 4097) is None
+
+def test_put_refreshes_existing_key_position():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 3)
+    cache.put("c", 4)
+    assert cache.get("b") is None
+    assert cache.get("a") == 3 and cache.get("c") == 4
@@ -0,0 +1,198 @@
+import io
+import os
+import pytest
+import zipfile
+import zipindex
+from zipindex import (
+    _acquire_zipfile,
+    _read_central_directory,
+    _release_zipfile,
+    extract_member,
+    find_in_dir_zips,
+    get_zip_index,
+    open_member,
+)
+
+def _make_zip(path, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+
+def test_index_lists_files_only(tmp_path):
+    zip_path = str(tmp_path / "test.zip")
+    _make_zip(zip_path, {"sub/": "", "sub/Game.uef": "abc", "readme.txt": "r"})
+    idx = get_zip_index(zip_path)
+    assert idx.namelist() == ("sub/Game.uef", "readme.txt")
+    assert idx.find("Game.uef") == "sub/Game.uef"
+    assert idx.find("Missing.uef") is None
+    assert idx.file_size("sub/Game.uef") == 3
+
+def test_index_rebuilt_when_zip_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(zipindex, "_INDEX_RECHECK_INTERVAL", 0)
+    zip_path = str(tmp_path / "test.zip")
+    _make_zip(zip_path, {"A.uef": "a"})
+    assert get_zip_index(zip_path).find("A.uef") == "A.uef"
+    _make_zip(zip_path, {"B.uef": "b"})
+    st = os.stat(zip_path)
+    os.utime(zip_path, (st.st_atime, st.st_mtime + 10))
+    idx = get_zip_index(zip_path)
+    assert idx.find("A.uef") is None
+    assert idx.find("B.uef") == "B.uef"
+
+def test_index_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    # Each one-member index weighs two, so two fit
+    monkeypatch.setattr(zipindex, "_ZIP_INDEX_CACHE_MEMBERS", 4)
+    monkeypatch.setattr(zipindex, "_zip_index_cache", zipindex.OrderedDict())
+    monkeypatch.setattr(zipindex, "_zip_index_members", 0)
+    paths = []
+    for i in range(3):
+        zip_path = str(tmp_path / f"{i}.zip")
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("a.uef", "x")
+        paths.append(zip_path)
+    get_zip_index(paths[0])
+    get_zip_index(paths[1])
+    get_zip_index(paths[0])
+    get_zip_index(paths[2])
+    assert list(zipindex._zip_index_cache) == [paths[0], paths[2]]
+
+def test_relisting_many_small_zips_reuses_indexes(tmp_path, monkeypatch):
+    # Recheck every call, so each lookup goes through the cache rather than returning early
+    monkeypatch.setattr(zipindex, "_INDEX_RECHECK_INTERVAL", 0)
+    monkeypatch.setattr(zipindex, "_zip_index_cache", zipindex.OrderedDict())
+    monkeypatch.setattr(zipindex, "_zip_index_members", 0)
+    paths = []
+    for i in range(300):
+        zip_path = str(tmp_path / f"{i}.zip")
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr(f"game{i}.uef", "x")
+        paths.append(zip_path)
+    first = [get_zip_index(path) for path in paths]
+    read_central_directory = zipindex._read_central_directory
+    parsed = []
+
+    def counting_read(zip_path):
+        parsed.append(zip_path)
+        return read_central_directory(zip_path)
+
+    monkeypatch.setattr(zipindex, "_read_central_directory", counting_read)
+    again = [get_zip_index(path) for path in paths]
+    assert parsed == []
+    assert all(a is b for a, b in zip(first, again))
+
+def test_names_grouped_by_extension(tmp_path):
+    zip_path = str(tmp_path / "test.zip")
+    _make_zip(zip_path, {"a/One.UEF": "1", "Two.uef": "2", "notes.txt": "n", "noext": "x"})
+    idx = get_zip_index(zip_path)
+    assert idx.names_with_ext("uef") == ("a/One.UEF", "Two.uef")
+    assert idx.names_with_ext("TXT") == ("notes.txt",)
+    assert idx.names_with_ext("MMB") == ()
+
+def test_find_in_dir_zips_skips_bad_archives(tmp_path):
+    (tmp_path / "Bad.zip").write_text("not a zip")
+    zip_path = str(tmp_path / "Good.zip")
+    _make_zip(zip_path, {"sub/Game.uef": "abc"})
+    assert find_in_dir_zips(str(tmp_path), "Game.uef") == (zip_path, "sub/Game.uef")
+    assert find_in_dir_zips(str(tmp_path), "Other.uef") is None
+    assert find_in_dir_zips(str(tmp_path / "missing"), "Game.uef") is None
+
+def test_central_directory_parse_matches_zipfile(tmp_path):
+    zip_path = str(tmp_path / "test.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("dir/", "")
+        zf.writestr("dir/Ünïcode.uef", "x" * 5000)
+        zf.writestr("plain.txt", "hello")
+        zf.comment = b"archive comment"
+    with open(zip_path, "rb") as f:
+        data = f.read()
+    prefixed_path = str(tmp_path / "prefixed.zip")
+    with open(prefixed_path, "wb") as f:
+        f.write(b"#!stub\n" + data)
+    for path in (zip_path, prefixed_path):
+        with zipfile.ZipFile(path) as zf:
+            expected = [(i.filename, i.file_size) for i in zf.infolist()]
+        names, sizes, _ = _read_central_directory(path)
+        assert list(zip(names, sizes)) == expected
+
+def test_central_directory_parse_zip64(tmp_path, monkeypatch):
+    zip_path = str(tmp_path / "zip64.zip")
+    # Shrink zipfile's limits so a tiny archive gets Zip64 records and extras
+    with monkeypatch.context() as m:
+        m.setattr(zipfile, "ZIP_FILECOUNT_LIMIT", 2)
+        m.setattr(zipfile, "ZIP64_LIMIT", 64)
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for i in range(4):
+                zf.writestr(f"game{i}.uef", bytes([65 + i]) * (100 * i + 10))
+    with open(zip_path, "rb") as f:
+        assert b"PK\x06\x07" in f.read()
+    with zipfile.ZipFile(zip_path) as zf:
+        expected = [(i.filename, i.file_size) for i in zf.infolist()]
+    names, sizes, _ = _read_central_directory(zip_path)
+    assert list(zip(names, sizes)) == expected
+    out = io.BytesIO()
+    extract_member(zip_path, "game3.uef", out)
+    assert out.getvalue() == b"D" * 310
+
+def test_extract_member_stored_and_deflated(tmp_path):
+    zip_path = str(tmp_path / "mixed.zip")
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("stored.uef", b"S" * 3000, compress_type=zipfile.ZIP_STORED)
+        zf.writestr("deflated.uef", b"D" * 3000, compress_type=zipfile.ZIP_DEFLATED)
+    idx = get_zip_index(zip_path)
+    assert idx.stored_offset("stored.uef") is not None
+    assert idx.stored_offset("deflated.uef") is None
+    for name, byte in (("stored.uef", b"S"), ("deflated.uef", b"D")):
+        out = io.BytesIO()
+        extract_member(zip_path, name, out)
+        assert out.getvalue() == byte * 3000
+
+def test_extract_member_reuses_pooled_zipfile(tmp_path):
+    zip_path = str(tmp_path / "deflated.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("a.uef", b"A" * 100)
+    idx = get_zip_index(zip_path)
+    first = _acquire_zipfile(idx)
+    _release_zipfile(idx, first)
+    extract_member(zip_path, "a.uef", io.BytesIO())
+    assert _acquire_zipfile(idx) is first
+
+def test_open_member_shares_read_only_copies(tmp_path, monkeypatch):
+    monkeypatch.setattr(zipindex, "_EXTRACTED_MAX_FILES", 1)
+    monkeypatch.setattr(zipindex, "_extracted", zipindex.OrderedDict())
+    monkeypatch.setattr(zipindex, "_extracted_bytes", 0)
+    zip_path = str(tmp_path / "games.zip")
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("a.uef", b"A" * 10)
+        zf.writestr("b.uef", b"B" * 10)
+    fds = [open_member(zip_path, "a.uef", os.O_RDONLY) for _ in range(2)]
+    try:
+        assert os.fstat(fds[0]).st_ino == os.fstat(fds[1]).st_ino
+        first_copy = zipindex._extracted[(zip_path, "a.uef")][1]
+        fds.append(open_member(zip_path, "b.uef", os.O_RDONLY))
+        # Evicted past the limit, but the fd opened before eviction still reads
+        assert not os.path.exists(first_copy)
+        assert os.pread(fds[0], 10, 0) == b"A" * 10
+        fds.append(open_member(zip_path, "a.uef", os.O_RDWR))
+        # Writable opens get a private copy that is already unlinked
+        assert os.fstat(fds[-1]).st_nlink == 0
+        assert os.pread(fds[-1], 10, 0) == b"A" * 10
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+def test_open_member_removes_copy_when_extraction_fails(tmp_path, monkeypatch):
+    extract_dir = tmp_path / "extracted"
+    extract_dir.mkdir()
+    monkeypatch.setattr(zipindex, "_extract_dir", str(extract_dir))
+    zip_path = str(tmp_path / "games.zip")
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("a.uef", b"A" * 1000)
+
+    def truncated(zip_path, name, dest):
+        dest.write(b"A" * 10)
+        raise zipfile.BadZipFile("Bad CRC-32 for file 'a.uef'")
+
+    monkeypatch.setattr(zipindex, "extract_member", truncated)
+    with pytest.raises(zipfile.BadZipFile):
+        open_member(zip_path, "a.uef", os.O_RDONLY)
+    assert os.listdir(extract_dir) == []